@@ -1,6 +1,40 @@
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.core import checks
+
+
+def check_ors_key(app_configs, **kwargs):
+    """Avisa uma vez (runserver/check/migrate) em vez de descobrir a cada request."""
+    if getattr(settings, "ORS_API_KEY", ""):
+        return []
+    return [
+        checks.Warning(
+            "ORS_API_KEY não configurada.",
+            hint="Defina ORS_API_KEY no .env; rotas e geocode vão responder 500.",
+            id="app_rotas.W001",
+        )
+    ]
+
+
+def check_bytecode_cache(app_configs, **kwargs):
+    """Sem .pyc gravado, todo start do processo volta a compilar os módulos."""
+    if not sys.dont_write_bytecode:
+        return []
+    return [
+        checks.Warning(
+            "Python rodando com PYTHONDONTWRITEBYTECODE (ou -B): .pyc não são gravados.",
+            hint="Remova a flag; em filesystem somente leitura use PYTHONPYCACHEPREFIX=/tmp/pyc.",
+            id="app_rotas.W002",
+        )
+    ]
 
 
 class AppRotasConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_rotas'
+
+    def ready(self):
+        checks.register(check_ors_key)
+        checks.register(check_bytecode_cache)
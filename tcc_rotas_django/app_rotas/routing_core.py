@@ -0,0 +1,112 @@
+"""
+Helpers puros de roteamento (opções do ORS, resumo da rota, parse de maxheight).
+
+Sem dependência de Django nem de I/O, e com tipos anotados, para poder ser
+compilado com mypyc quando o ganho valer a pena:
+    mypyc app_rotas/routing_core.py
+O import é o mesmo com a versão compilada ou com o .py.
+"""
+
+from typing import Any, Optional
+
+import ijson
+
+# ---- Opções do ORS ----
+
+ALLOWED_AVOIDS = frozenset({"tollways", "ferries", "highways", "steps", "fords", "pavedroads", "unpavedroads"})
+
+def sanitize_avoids(avoid_features: Any) -> list[str]:
+    # interseção em C; remove duplicatas e ordena para um payload estável
+    return sorted(ALLOWED_AVOIDS.intersection(avoid_features or ()))
+
+def kg_to_t_if_needed(v: Any) -> Any:
+    """Converte kg para toneladas se parecer estar em kg (v > 1000)."""
+    if v is None:
+        return None
+    try:
+        v = float(v)
+    except Exception:
+        return v
+    return v / 1000.0 if v > 1000 else v
+
+def extract_summary(raw: bytes) -> Optional[dict]:
+    """
+    Lê do geojson (bytes) só as properties da primeira feature e o bbox de topo,
+    via ijson, sem materializar as geometrias. JSON inválido levanta ValueError.
+    """
+    try:
+        props = next(ijson.items(raw, "features.item.properties", use_float=True), None)
+        bbox = next(ijson.items(raw, "bbox", use_float=True), None)
+    except ijson.JSONError as e:
+        raise ValueError(str(e))
+    try:
+        summary = props["summary"]
+        return {
+            "distance_m": summary.get("distance"),
+            "duration_s": summary.get("duration"),
+            "segments": props.get("segments"),
+            "bbox": bbox,
+        }
+    except Exception:
+        return None
+
+# ---- Parse de maxheight (OSM -> metros) ----
+
+FEET_IN_M = 0.3048
+
+# Sufixo de unidade -> fator para metros ("metros"/"meter" antes de "m")
+_UNIT_SUFFIXES = (
+    ("metros", 1.0), ("meter", 1.0), ("m", 1.0),
+    ("feet", FEET_IN_M), ("foot", FEET_IN_M), ("ft", FEET_IN_M),
+)
+
+def _to_float(s: Any) -> Optional[float]:
+    try:
+        return float(s)
+    except Exception:
+        try:
+            return float(str(s).replace(",", "."))  # "3,8" -> 3.8
+        except Exception:
+            return None
+
+def _is_digits(s: str) -> bool:
+    """Só dígitos ASCII, como o [0-9] das regexes antigas (isdecimal sozinho aceita "٣")."""
+    return s.isascii() and s.isdecimal()
+
+def _is_decimal(s: str, trailing_sep: bool = True) -> bool:
+    """Dígitos com no máximo um separador ("3", "3.5", "3,5"; "3." se trailing_sep)."""
+    head, sep, tail = s.replace(",", ".").partition(".")
+    return _is_digits(head) and (_is_digits(tail) or (not tail and (trailing_sep or not sep)))
+
+def parse_maxheight_to_meters(raw: Any) -> Optional[float]:
+    """
+    Converte valores OSM comuns para metros.
+    Exemplos aceitos:
+      "3.5", "3,5", "3.5 m", "3,5 m", "10'6\"", "10' 6\"", "10 ft", "10ft"
+    Retorna float em metros ou None.
+    """
+    if not raw:
+        return None
+    s = str(raw).strip().lower()
+
+    # 1) Notação pés e polegadas: 10'6" ou 10' 6"
+    if "'" in s:
+        ft, _, inch = s.partition("'")
+        ft = ft.strip()
+        inch = inch.strip().removesuffix('"').rstrip()
+        # pés com isdecimal (o \d antigo aceitava qualquer dígito Unicode), polegadas só ASCII
+        if ft.isdecimal() and _is_digits(inch):
+            return int(ft) * FEET_IN_M + (int(inch)/12.0) * FEET_IN_M
+        return None
+
+    # 2) Unidade explícita: "3.5 m", "4 metros", "10ft", "10 feet"
+    for suffix, factor in _UNIT_SUFFIXES:
+        if s.endswith(suffix):
+            num = s[:-len(suffix)].rstrip()
+            if not _is_decimal(num, trailing_sep=factor == 1.0):
+                return None
+            val = _to_float(num)
+            return val * factor if val is not None else None
+
+    # 3) Valor puro onde não sabemos unidade: assume metros
+    return _to_float(s)
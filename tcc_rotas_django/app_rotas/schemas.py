@@ -0,0 +1,87 @@
+"""
+Schemas dos bodies JSON da API (Pydantic v2).
+
+`Model.model_validate_json(request.body)` faz o parse do JSON e a validação/coerção
+em Rust (pydantic-core), no lugar de json.loads + float()/try/except em Python.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+class Point(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lng: float = Field(ge=-180, le=180)
+
+
+class RouteBody(BaseModel):
+    origin: Point
+    destination: Point
+    waypoints: Optional[list[Point]] = None
+    avoid_features: Optional[list[str]] = None
+
+    def coordinates(self):
+        # ORS usa [lon, lat]
+        return [[p.lng, p.lat] for p in (self.origin, *(self.waypoints or ()), self.destination)]
+
+
+class Truck(BaseModel):
+    height: Optional[float] = None
+    width: Optional[float] = None
+    length: Optional[float] = None
+    weight: Optional[float] = None     # kg ou t
+    axleload: Optional[float] = None   # kg ou t
+
+
+class TruckRouteBody(RouteBody):
+    truck: Optional[Truck] = None
+
+
+class GeocodeBody(BaseModel):
+    q: Optional[str] = None
+    limit: Optional[int] = None
+    country: Optional[str] = None
+    lang: Optional[str] = None
+    focus_lat: Optional[float] = None
+    focus_lng: Optional[float] = None
+    rect_north: Optional[float] = None
+    rect_south: Optional[float] = None
+    rect_east: Optional[float] = None
+    rect_west: Optional[float] = None
+
+
+# Tipo de erro do pydantic -> mensagem em pt-br (o front mostra "error" direto ao usuário)
+_MESSAGES = {
+    "missing": "{loc} é obrigatório.",
+    "less_than_equal": "{loc} fora de faixa.",
+    "greater_than_equal": "{loc} fora de faixa.",
+    "less_than": "{loc} fora de faixa.",
+    "greater_than": "{loc} fora de faixa.",
+    "float_parsing": "{loc} inválido. Esperado número.",
+    "float_type": "{loc} inválido. Esperado número.",
+    "int_parsing": "{loc} inválido. Esperado número inteiro.",
+    "int_type": "{loc} inválido. Esperado número inteiro.",
+    "model_type": "{loc} inválido. Esperado um objeto.",
+    "list_type": "{loc} inválido. Esperado uma lista.",
+    "string_type": "{loc} inválido. Esperado texto.",
+}
+# Erros do corpo inteiro (sem loc)
+_ROOT_MESSAGES = {
+    "json_invalid": "JSON inválido.",
+    "model_type": "O corpo deve ser um objeto JSON.",
+}
+
+
+def error_message(exc: ValidationError) -> str:
+    """Resumo de uma linha dos erros, ex.: "origin.lat fora de faixa."."""
+    parts = []
+    for err in exc.errors(include_url=False):
+        loc = ".".join(str(x) for x in err["loc"])
+        template = (_MESSAGES if loc else _ROOT_MESSAGES).get(err["type"])
+        if template:
+            parts.append(template.format(loc=loc))
+        else:
+            parts.append(f"{loc}: {err['msg']}" if loc else err["msg"])
+    return " ".join(parts)
+
@@ -1,3 +1,198 @@
-from django.test import TestCase
+from unittest import mock
+from urllib.parse import parse_qs
 
-# Create your tests here.
+import httpx
+import orjson
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from pydantic import ValidationError
+
+from . import views
+from .routing_core import parse_maxheight_to_meters
+from .schemas import RouteBody, error_message
+
+
+def mock_upstream(handler):
+    """Troca o cliente HTTP das views por um httpx.MockTransport que responde com `handler`."""
+    return mock.patch.object(
+        views, "_get_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+class ParseMaxheightTests(SimpleTestCase):
+    def test_metros(self):
+        for raw in ("3.5", "3,5", "3.5 m", "3,5 m", "3.5M", "3.5 metros", "3.5 meter"):
+            with self.subTest(raw=raw):
+                self.assertAlmostEqual(parse_maxheight_to_meters(raw), 3.5)
+
+    def test_pes_e_polegadas(self):
+        for raw in ("10'6\"", "10' 6\"", "10'6"):
+            with self.subTest(raw=raw):
+                self.assertAlmostEqual(parse_maxheight_to_meters(raw), 3.2004)
+
+    def test_pes(self):
+        for raw in ("10 ft", "10ft", "10 feet", "10 foot"):
+            with self.subTest(raw=raw):
+                self.assertAlmostEqual(parse_maxheight_to_meters(raw), 3.048)
+
+    def test_invalidos(self):
+        for raw in (None, "", "default", "none", "3.5 m;4", "4 meters", "10'", ".5 m", "3.ft",
+                    "٣m", "٣ ft", "1٣m"):  # dígitos não ASCII com unidade, como no [0-9] antigo
+            with self.subTest(raw=raw):
+                self.assertIsNone(parse_maxheight_to_meters(raw))
+
+
+class ErrorMessageTests(SimpleTestCase):
+    def _message(self, raw):
+        with self.assertRaises(ValidationError) as ctx:
+            RouteBody.model_validate_json(raw)
+        return error_message(ctx.exception)
+
+    def test_json_invalido(self):
+        self.assertEqual(self._message(b"{"), "JSON inválido.")
+
+    def test_fora_de_faixa_e_obrigatorio(self):
+        self.assertEqual(
+            self._message(b'{"origin": {"lat": 91, "lng": 0}}'),
+            "origin.lat fora de faixa. destination é obrigatório.",
+        )
+
+    def test_numero_invalido(self):
+        msg = self._message(b'{"origin": {"lat": "x", "lng": 0}, "destination": {"lat": 0, "lng": 0}}')
+        self.assertEqual(msg, "origin.lat inválido. Esperado número.")
+
+
+OVERPASS_HEADER = "@type\t@id\t@lat\t@lon\tmaxheight\tmaxheight:physical\tbridge\ttunnel\n"
+OVERPASS_CSV = {
+    "node": OVERPASS_HEADER
+    + "node\t1\t-25.5\t-54.6\t3,5\t\t\t\n"
+    + "node\t2\t-25.51\t-54.61\t10'6\"\t\t\t\n",
+    "way": OVERPASS_HEADER
+    + "way\t1\t-25.52\t-54.62\t\t4.2\tyes\t\n"
+    + "way\t1\t-25.52\t-54.62\t\t4.2\tyes\t\n"  # repetida: entra uma vez só
+    + "way\t3\t\t\t3.0\t\t\tyes\n"  # via sem center: ignorada
+    + "way\t4\n"  # linha curta: ignorada
+    + "way\t5\t-25.53\t-54.63\t3\tm\t\t\t\n",  # tab dentro do valor (9 colunas): ignorada
+}
+
+
+class ObstaculosAlturaTests(SimpleTestCase):
+    def setUp(self):
+        self.queries = []
+
+    def overpass(self, request):
+        query = parse_qs(request.content.decode())["data"][0]
+        self.queries.append(query)
+        osm_type = "way" if "way[" in query else "node"
+        return httpx.Response(200, text=OVERPASS_CSV[osm_type])
+
+    def post(self, body):
+        with mock_upstream(self.overpass):
+            return self.client.post("/api/obstaculos-altura", body, content_type="application/json")
+
+    def test_csv_das_duas_subconsultas(self):
+        r = self.post({"bbox": {"south": -25.6, "west": -54.65, "north": -25.45, "east": -54.5}})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(len(self.queries), 2)
+        data = orjson.loads(r.content)
+        self.assertFalse(data["filtered_by_height"])
+        # nós sem bridge/tunnel também saem com kind "way"
+        feats = {(f["kind"], f["osm_id"]): f for f in data["features"]}
+        self.assertEqual(sorted(feats), [("bridge", 1), ("way", 1), ("way", 2)])
+        self.assertEqual(feats[("way", 1)]["maxheight"], "3,5")
+        self.assertAlmostEqual(feats[("way", 1)]["maxheight_m"], 3.5)
+        self.assertAlmostEqual(feats[("way", 2)]["maxheight_m"], 3.2004)
+        self.assertEqual(feats[("way", 2)]["maxheight"], "10'6\"")
+        self.assertEqual(feats[("bridge", 1)], {
+            "lat": -25.52, "lng": -54.62, "maxheight": "4.2", "maxheight_m": 4.2,
+            "kind": "bridge", "osm_id": 1,
+        })
+
+    def test_filtro_por_altura(self):
+        r = self.post({
+            "bbox": {"south": -25.6, "west": -54.65, "north": -25.45, "east": -54.5},
+            "vehicle_height_m": 3.6,
+        })
+        data = orjson.loads(r.content)
+        self.assertTrue(data["filtered_by_height"])
+        self.assertEqual(sorted(f["osm_id"] for f in data["features"]), [1, 2])
+        self.assertTrue(all(f["maxheight_m"] < 3.6 for f in data["features"]))
+
+    def test_erro_do_overpass(self):
+        # Retry-After acima do limite: _request devolve o 504 sem esperar os retries
+        with mock_upstream(lambda request: httpx.Response(504, headers={"Retry-After": "60"})):
+            r = self.client.post(
+                "/api/obstaculos-altura",
+                {"bbox": {"south": 0, "west": 0, "north": 1, "east": 1}},
+                content_type="application/json",
+            )
+        self.assertEqual(r.status_code, 502)
+
+
+ORS_GEOJSON = orjson.dumps({
+    "bbox": [-54.62, -25.51, -54.58, -25.44],
+    "features": [{"properties": {"summary": {"distance": 1000.0, "duration": 60.0}, "segments": []}}],
+})
+
+
+@mock.patch.object(views, "_ORS_READY", True)
+class RotaETagTests(SimpleTestCase):
+    body = {
+        "origin": {"lat": -25.51, "lng": -54.58},
+        "destination": {"lat": -25.44, "lng": -54.62},
+        "avoid_features": ["tollways", "ferries"],
+    }
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def ors(self, request):
+        self.calls += 1
+        return httpx.Response(200, content=ORS_GEOJSON)
+
+    def post(self, body, **headers):
+        with mock_upstream(self.ors):
+            return self.client.post("/api/rota-carro", body, content_type="application/json", headers=headers)
+
+    def test_etag_e_304_sem_chamar_o_ors(self):
+        r = self.post(self.body)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(orjson.loads(r.content)["summary"]["distance_m"], 1000.0)
+        etag = r["ETag"]
+        self.assertRegex(etag, r'^"[0-9a-f]{16}"$')
+        self.assertEqual(self.calls, 1)
+
+        cache.clear()  # o 304 não depende do cache de rota
+        r = self.post(self.body, if_none_match=etag)
+        self.assertEqual(r.status_code, 304)
+        self.assertEqual(r.content, b"")
+        self.assertEqual(r["ETag"], etag)
+        self.assertEqual(self.calls, 1)
+
+    def test_etag_diferente_refaz_a_rota(self):
+        r = self.post(self.body, if_none_match='"0000000000000000"')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self.calls, 1)
+
+    def test_corpo_truncado_do_ors_nao_vai_para_o_cache(self):
+        truncado = ORS_GEOJSON[:-2]  # resumo completo, mas falta fechar features e o objeto
+        with mock_upstream(lambda request: httpx.Response(200, content=truncado)):
+            r = self.client.post("/api/rota-carro", self.body, content_type="application/json")
+        self.assertEqual(r.status_code, 502)
+        self.assertEqual(orjson.loads(r.content)["error"], "Falha ao interpretar resposta do ORS")
+        r = self.post(self.body)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(self.calls, 1)
+
+    def test_corpos_equivalentes_tem_mesmo_etag(self):
+        etag = self.post(self.body)["ETag"]
+        equivalente = {
+            "origin": {"lat": -25.510001, "lng": -54.580004},  # difere só após a 5ª casa
+            "destination": {"lat": -25.44, "lng": -54.62},
+            "avoid_features": ["ferries", "tollways", "ferries", "desconhecido"],
+        }
+        self.assertEqual(self.post(equivalente)["ETag"], etag)
+        outro = {**self.body, "destination": {"lat": -25.45, "lng": -54.62}}
+        self.assertNotEqual(self.post(outro)["ETag"], etag)
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import rota_carro, rota_caminhao, geocode_search, health
+from .views import rota_carro, rota_caminhao, geocode_search, health, obstaculos_altura
 
 urlpatterns = [
     path('rota-carro', rota_carro),
     path('rota-caminhao', rota_caminhao),
-     path('geocode', geocode_search), 
-     path('health', health)
+    path('geocode', geocode_search),
+    path('health', health),
+    path('obstaculos-altura', obstaculos_altura),
 ]
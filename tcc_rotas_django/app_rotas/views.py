@@ -1,153 +1,326 @@
-import json
-import re
-import requests
-from django.http import JsonResponse
+import asyncio
+import csv
+import email.utils
+import functools
+import hashlib
+import importlib.util
+import io
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+import httpx
+import orjson
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
+from pydantic import ValidationError
 
-# ---- Config ORS ----
-ORS_KEY = getattr(settings, "ORS_API_KEY", "")
+from .routing_core import extract_summary, kg_to_t_if_needed, parse_maxheight_to_meters, sanitize_avoids
+from .schemas import GeocodeBody, RouteBody, Truck, TruckRouteBody, error_message
 
-# ---- HTTP Session com retry/timeout ----
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+logger = logging.getLogger(__name__)
 
-_session = requests.Session()
-_retry = Retry(
-    total=3, backoff_factor=0.4,
-    status_forcelist=[429, 500, 502, 503, 504],
-    allowed_methods=frozenset(["GET", "POST"])
-)
-_session.mount("https://", HTTPAdapter(max_retries=_retry))
+# ---- Config ORS ----
+ORS_KEY = str(getattr(settings, "ORS_API_KEY", ""))  # resolve o proxy lazy; httpx exige str no header
+_ORS_READY = bool(ORS_KEY)  # falta da chave também é avisada pelo check app_rotas.W001
+# Headers fixos do ORS montados uma vez (o Content-Type vem do json=); não vão como
+# default do cliente porque ele também é usado para o Overpass.
+_ORS_HEADERS = {"Authorization": ORS_KEY}
+GEOCODE_CACHE_TTL = getattr(settings, "GEOCODE_CACHE_TTL", 48 * 3600)
+GEOCODE_LRU_SIZE = getattr(settings, "GEOCODE_LRU_SIZE", 1024)
+ROUTE_CACHE_TTL = getattr(settings, "ROUTE_CACHE_TTL", 3600)
+ROUTE_CACHE_MAX_BYTES = getattr(settings, "ROUTE_CACHE_MAX_BYTES", 512 * 1024)
+ROUTE_CACHE_CONTROL = f"private, max-age={ROUTE_CACHE_TTL}"
+
+# ---- Cliente HTTP assíncrono com retry/timeout ----
 DEFAULT_TIMEOUT = 30
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.4
+_RETRY_STATUS = frozenset([429, 500, 502, 503, 504])
+_RETRY_AFTER_MAX = 10  # segundos; Retry-After maior devolve a resposta em vez de segurar o request
+# Pool dimensionado para a concorrência esperada por worker (vale para http e https)
+_LIMITS = httpx.Limits(
+    max_keepalive_connections=getattr(settings, "HTTP_POOL_KEEPALIVE", 64),
+    max_connections=getattr(settings, "HTTP_POOL_MAXSIZE", 128),
+)
+# HTTP/2 multiplexa as requisições concorrentes numa só conexão TLS por host;
+# depende do pacote h2 (httpx[http2]) e cai para HTTP/1.1 se ele não existir.
+_HTTP2 = getattr(settings, "HTTP2_ENABLED", True) and importlib.util.find_spec("h2") is not None
+
+# Um AsyncClient por event loop: sob ASGI (uvicorn) há um loop por worker e o pool
+# é compartilhado por todas as requisições. Sob WSGI/runserver o Django roda cada
+# view async num loop novo, que morre com o request; aí o cliente é fechado no fim
+# da view (ver _closes_client_off_asgi) e não há reuso de conexões entre requests.
+_clients = weakref.WeakKeyDictionary()
+
+def _get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                http2=_HTTP2,
+                retries=_RETRY_TOTAL,  # falhas de conexão
+                limits=_LIMITS,
+            ),
+        )
+        _clients[loop] = client
+    return client
 
-# ---- Helpers ----
-
-def _ensure_key():
-    if not ORS_KEY:
-        return JsonResponse({"error": "ORS_API_KEY não configurada no .env"}, status=500)
-
-def _validate_point(p, name):
-    try:
-        lat = float(p["lat"]); lng = float(p["lng"])
-    except Exception:
-        raise ValueError(f"{name} inválido. Esperado {{lat, lng}} numéricos.")
-    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
-        raise ValueError(f"{name} fora de faixa.")
-    return lat, lng
-
-def _build_coordinates(origin, waypoints, destination):
-    # ORS usa [lon, lat]
-    coords = []
-    o_lat, o_lng = _validate_point(origin, "origin")
-    coords.append([o_lng, o_lat])
-    for i, w in enumerate(waypoints or []):
-        w_lat, w_lng = _validate_point(w, f"waypoint[{i}]")
-        coords.append([w_lng, w_lat])
-    d_lat, d_lng = _validate_point(destination, "destination")
-    coords.append([d_lng, d_lat])
-    return coords
-
-_ALLOWED_AVOIDS = {"tollways", "ferries", "highways", "steps", "fords", "pavedroads", "unpavedroads"}
-
-def _sanitize_avoids(avoid_features):
-    if not avoid_features:
-        return []
-    return [a for a in avoid_features if a in _ALLOWED_AVOIDS]
-
-def _kg_to_t_if_needed(v):
-    """Converte kg para toneladas se parecer estar em kg (v > 1000)."""
-    if v is None:
+def _closes_client_off_asgi(view):
+    """
+    Fora do ASGI fecha, ao fim da view, o cliente do loop do request: as conexões
+    do pool seguram o loop e o cliente nunca sairia do _clients, deixando sockets abertos.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        finally:
+            if not isinstance(request, ASGIRequest):
+                client = _clients.pop(asyncio.get_running_loop(), None)
+                if client is not None:
+                    await client.aclose()
+    return wrapper
+
+def _retry_after(r):
+    """Segundos pedidos no Retry-After (inteiro ou data HTTP); None se ausente/inválido."""
+    value = r.headers.get("Retry-After")
+    if not value:
         return None
     try:
-        v = float(v)
-    except Exception:
-        return v
-    return v / 1000.0 if v > 1000 else v
-
-def _call_ors_directions(profile, payload):
-    try:
-        r = _session.post(
-            f"https://api.openrouteservice.org/v2/directions/{profile}/geojson",
-            headers={"Authorization": ORS_KEY, "Content-Type": "application/json"},
-            json=payload, timeout=DEFAULT_TIMEOUT
-        )
-        data = r.json()
+        return max(0.0, float(value))
     except ValueError:
-        return JsonResponse({"error": "Falha ao interpretar resposta do ORS", "raw": r.text if 'r' in locals() else ""}, status=502)
-    except Exception as e:
-        return JsonResponse({"error": f"Erro de rede ao chamar ORS: {e}"}, status=502)
-
-    if r.status_code != 200:
-        return JsonResponse({"error": "Erro do ORS", "status": r.status_code, "detail": data}, status=r.status_code)
-    return data
-
-def _extract_summary(geojson):
+        pass
     try:
-        props = geojson["features"][0]["properties"]
-        summary = props["summary"]
-        return {
-            "distance_m": summary.get("distance"),
-            "duration_s": summary.get("duration"),
-            "segments": props.get("segments"),
-            "bbox": geojson.get("bbox"),
-        }
-    except Exception:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
         return None
 
-# ---- Parse de maxheight (OSM -> metros) ----
+async def _request(method, url, **kwargs):
+    """
+    Requisição com backoff exponencial para 429/5xx, respeitando Retry-After
+    (mesma política do antigo Retry do urllib3).
+    """
+    client = _get_client()
+    for attempt in range(_RETRY_TOTAL + 1):
+        r = await client.request(method, url, **kwargs)
+        if r.status_code not in _RETRY_STATUS or attempt == _RETRY_TOTAL:
+            return r
+        delay = _RETRY_BACKOFF * (2 ** attempt)
+        wait = _retry_after(r)
+        if wait is not None:
+            if wait > _RETRY_AFTER_MAX:
+                return r
+            delay = max(delay, wait)
+        await asyncio.sleep(delay)
 
-_FEET_IN_M = 0.3048
+# ---- Helpers ----
 
-def _to_float(s):
-    try:
-        return float(s)
-    except Exception:
-        try:
-            return float(str(s).replace(",", "."))  # "3,8" -> 3.8
-        except Exception:
-            return None
+class OrjsonResponse(HttpResponse):
+    """JsonResponse equivalente serializado com orjson (bytes direto, sem str intermediária)."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(orjson.dumps(data), **kwargs)
+
+def _missing_key():
+    return OrjsonResponse({"error": "ORS_API_KEY não configurada no .env"}, status=500)
 
-def _parse_maxheight_to_meters(raw):
+@functools.lru_cache(maxsize=32)
+def _payload_builder(profile, avoid):
     """
-    Converte valores OSM comuns para metros.
-    Exemplos aceitos:
-      "3.5", "3,5", "3.5 m", "3,5 m", "10'6\"", "10' 6\"", "10 ft", "10ft"
-    Retorna float em metros ou None.
+    Função que monta o payload do ORS para um (perfil, avoid_features), com as opções
+    fixas resolvidas uma vez; por request variam só coordenadas e restrições.
     """
-    if not raw:
-        return None
-    s = str(raw).strip().lower()
+    base_options = {}
+    if avoid:
+        base_options["avoid_features"] = avoid  # tupla (imutável); orjson serializa como lista
+    if profile == "driving-hgv":
+        base_options["vehicle_type"] = "hgv"
 
-    # 1) Já em metros explícitos ou implícitos
-    m_num = re.match(r"^\s*([0-9]+[.,]?[0-9]*)\s*(m|meter|metros)?\s*$", s)
-    if m_num:
-        return _to_float(m_num.group(1))
+    def build(coords, restrictions=None):
+        payload = {
+            "coordinates": coords,
+            "instructions": True,
+        }
+        if restrictions:
+            payload["options"] = {**base_options, "profile_params": {"restrictions": restrictions}}
+        elif base_options:
+            payload["options"] = {**base_options}  # cópia: o dict em cache não sai daqui
+        return payload
+
+    return build
+
+def _route_cache_key(profile, payload):
+    """Chave da rota: perfil + coordenadas arredondadas a 5 casas (~1 m) + opções ordenadas."""
+    norm = dict(payload)
+    norm["coordinates"] = [[round(lon, 5), round(lat, 5)] for lon, lat in payload["coordinates"]]
+    options = dict(payload.get("options") or {})
+    if "avoid_features" in options:
+        options["avoid_features"] = sorted(options["avoid_features"])
+    norm["options"] = options
+    raw = orjson.dumps([profile, norm], option=orjson.OPT_SORT_KEYS)
+    return "route:" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+async def _call_ors_directions(profile, payload, key):
+    """
+    Retorna o corpo JSON (bytes) {"summary": ..., "geojson": ...} ou um OrjsonResponse de erro.
+    O geojson do ORS é repassado como veio, sem decodificar/recodificar.
+    Respostas 200 ficam no cache (chave `key`) por ROUTE_CACHE_TTL, exceto as muito grandes.
+    """
+    try:
+        cached = await cache.aget(key)
+    except Exception as e:
+        logger.warning("Falha ao ler cache de rota: %s", e)
+        cached = None
+    if cached is not None:
+        return cached
 
-    # 2) Notação pés e polegadas: 10'6" ou 10' 6"
-    m_ft_in = re.match(r"^\s*(\d+)\s*'\s*([0-9]+)\s*\"?\s*$", s)
-    if m_ft_in:
-        ft = int(m_ft_in.group(1))
-        inch = int(m_ft_in.group(2))
-        return ft * _FEET_IN_M + (inch/12.0) * _FEET_IN_M
+    try:
+        r = await _request(
+            "POST", f"https://api.openrouteservice.org/v2/directions/{profile}/geojson",
+            headers=_ORS_HEADERS,
+            json=payload
+        )
+        if r.status_code != 200:
+            return OrjsonResponse({"error": "Erro do ORS", "status": r.status_code, "detail": r.json()}, status=r.status_code)
+        summary = extract_summary(r.content)
+        # o ijson para no resumo; valida o corpo inteiro antes de repassar/cachear
+        # (JSONDecodeError é ValueError: corpo truncado cai no 502 abaixo)
+        orjson.loads(r.content)
+    except ValueError:
+        return OrjsonResponse({"error": "Falha ao interpretar resposta do ORS", "raw": r.text if 'r' in locals() else ""}, status=502)
+    except Exception as e:
+        return OrjsonResponse({"error": f"Erro de rede ao chamar ORS: {e}"}, status=502)
 
-    # 3) Apenas pés: "10ft", "10 ft"
-    m_ft = re.match(r"^\s*([0-9]+(?:[.,][0-9]+)?)\s*(ft|foot|feet)\s*$", s)
-    if m_ft:
-        return _to_float(m_ft.group(1)) * _FEET_IN_M
+    body = b''.join((b'{"summary":', orjson.dumps(summary), b',"geojson":', r.content, b'}'))
+    # rotas longas podem ter geometrias de MB; não ocupa o Redis com elas
+    if len(body) <= ROUTE_CACHE_MAX_BYTES:
+        try:
+            await cache.aset(key, body, ROUTE_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Falha ao gravar cache de rota: %s", e)
+    return body
 
-    # 4) Valor puro onde não sabemos unidade: assume metros
-    val = _to_float(s)
-    return val
+async def _route_response(request, profile, payload):
+    """
+    Resposta final de rota-carro/rota-caminhao, com ETag derivado da chave de cache.
+    Se o cliente mandar If-None-Match com esse ETag, devolve 304 sem chamar o ORS.
+    """
+    key = _route_cache_key(profile, payload)
+    etag = f'"{key.partition(":")[2][:16]}"'
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        resp = HttpResponseNotModified()
+    else:
+        result = await _call_ors_directions(profile, payload, key)
+        if isinstance(result, OrjsonResponse):
+            return result
+        resp = HttpResponse(result, status=200, content_type="application/json")
+    resp["ETag"] = etag
+    resp["Cache-Control"] = ROUTE_CACHE_CONTROL
+    return resp
+
+async def _fanout(calls):
+    """Executa chamadas independentes em paralelo; exceções voltam como itens do resultado."""
+    return await asyncio.gather(*calls, return_exceptions=True)
+
+# ---- Cache de geocode ----
+
+def _geocode_cache_key(params):
+    """
+    Chave estável para a busca: texto normalizado e coordenadas (focus/rect)
+    arredondadas a 3 casas (~100 m), para que buscas próximas compartilhem entrada.
+    """
+    norm = {k: v for k, v in params.items() if k != "api_key"}
+    norm["text"] = norm["text"].lower().strip()
+    for k, v in norm.items():
+        if isinstance(v, float):
+            norm[k] = round(v, 3)
+    raw = orjson.dumps(norm, option=orjson.OPT_SORT_KEYS)
+    return "geocode:" + hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+# 1º nível, dentro do processo: absorve as repetições do autocomplete sem ir ao Redis.
+# Entradas: chave -> (expira_em, results), com o mesmo TTL do cache compartilhado.
+# Sob WSGI cada thread tem seu loop, então get/move/popitem precisam do lock.
+_geocode_lru = OrderedDict()
+_geocode_lru_lock = threading.Lock()
+
+def _lru_get(key):
+    with _geocode_lru_lock:
+        hit = _geocode_lru.get(key)
+        if hit is None:
+            return None
+        if hit[0] < time.monotonic():
+            _geocode_lru.pop(key, None)
+            return None
+        _geocode_lru.move_to_end(key)
+        return hit[1]
+
+def _lru_put(key, results):
+    with _geocode_lru_lock:
+        _geocode_lru[key] = (time.monotonic() + GEOCODE_CACHE_TTL, results)
+        _geocode_lru.move_to_end(key)
+        while len(_geocode_lru) > GEOCODE_LRU_SIZE:
+            _geocode_lru.popitem(last=False)
+
+async def _cached_geocode(params):
+    """Chama o geocode do ORS passando antes pelos caches; falhas do cache caem na API."""
+    key = _geocode_cache_key(params)
+    results = _lru_get(key)
+    if results is not None:
+        return results
+    try:
+        results = await cache.aget(key)
+    except Exception as e:
+        logger.warning("Falha ao ler cache de geocode: %s", e)
+        results = None
+    if results is not None:
+        _lru_put(key, results)
+        return results
+
+    r = await _request("GET", "https://api.openrouteservice.org/geocode/search", params=params)
+    data = r.json()
+
+    results = []
+    for feat in data.get("features", []):
+        coords = feat.get("geometry", {}).get("coordinates", [])
+        props = feat.get("properties", {})
+        if len(coords) == 2:
+            results.append({
+                "label": props.get("label") or props.get("name") or "resultado",
+                "lng": coords[0],
+                "lat": coords[1],
+            })
+
+    # só guarda respostas válidas (não cacheia erro/quota do ORS)
+    if r.status_code == 200:
+        _lru_put(key, results)
+        try:
+            await cache.aset(key, results, GEOCODE_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Falha ao gravar cache de geocode: %s", e)
+    return results
 
 # ---- Endpoints ----
 
+_HEALTH_BODY = b'{"ok":true}'
+
 @csrf_exempt
-def health(request):
-    return JsonResponse({"ok": True})
+async def health(request):
+    # corpo pré-serializado; a resposta em si é nova a cada vez porque os
+    # middlewares alteram headers do objeto
+    return HttpResponse(_HEALTH_BODY, content_type="application/json")
 
 @csrf_exempt
-def geocode_search(request):
+@_closes_client_off_asgi
+async def geocode_search(request):
     """
     POST /api/geocode
     Body (todos os campos opcionais exceto q):
@@ -161,21 +334,25 @@ def geocode_search(request):
     }
     """
     if request.method != "POST":
-        return JsonResponse({"error": "POST only"}, status=405)
-    if (err := _ensure_key()) is not None:
-        return err
+        return OrjsonResponse({"error": "POST only"}, status=405)
+    if not _ORS_READY:
+        return _missing_key()
+
+    try:
+        body = GeocodeBody.model_validate_json(request.body)
+    except ValidationError as e:
+        return OrjsonResponse({"error": error_message(e)}, status=400)
 
     try:
-        body = json.loads(request.body.decode("utf-8"))
-        q = (body.get("q") or "").strip()
+        q = (body.q or "").strip()
         if not q:
-            return JsonResponse({"error": "q (texto de busca) é obrigatório"}, status=400)
+            return OrjsonResponse({"error": "q (texto de busca) é obrigatório"}, status=400)
 
-        size = int(body.get("limit") or 5)
-        country = body.get("country")
+        size = body.limit or 5
+        country = body.country
         if country is None:
             country = "BR"
-        lang = (body.get("lang") or "pt").strip()
+        lang = (body.lang or "pt").strip()
 
         params = {
             "api_key": ORS_KEY,
@@ -184,40 +361,28 @@ def geocode_search(request):
             "lang": lang,
         }
 
-        if isinstance(country, str) and country.strip():
+        if country.strip():
             params["boundary.country"] = country.strip()
 
-        if body.get("focus_lat") is not None and body.get("focus_lng") is not None:
-            params["focus.point.lat"] = float(body["focus_lat"])
-            params["focus.point.lon"] = float(body["focus_lng"])
-
-        rect_keys = ["rect_north", "rect_south", "rect_east", "rect_west"]
-        if all(k in body for k in rect_keys):
-            params["boundary.rect.min_lat"] = float(body["rect_south"])
-            params["boundary.rect.min_lon"] = float(body["rect_west"])
-            params["boundary.rect.max_lat"] = float(body["rect_north"])
-            params["boundary.rect.max_lon"] = float(body["rect_east"])
-
-        r = _session.get("https://api.openrouteservice.org/geocode/search", params=params, timeout=DEFAULT_TIMEOUT)
-        data = r.json()
-
-        results = []
-        for feat in data.get("features", []):
-            coords = feat.get("geometry", {}).get("coordinates", [])
-            props = feat.get("properties", {})
-            if len(coords) == 2:
-                results.append({
-                    "label": props.get("label") or props.get("name") or "resultado",
-                    "lng": coords[0],
-                    "lat": coords[1],
-                })
-
-        return JsonResponse({"results": results}, status=200)
+        if body.focus_lat is not None and body.focus_lng is not None:
+            params["focus.point.lat"] = body.focus_lat
+            params["focus.point.lon"] = body.focus_lng
+
+        rect = (body.rect_north, body.rect_south, body.rect_east, body.rect_west)
+        if None not in rect:
+            params["boundary.rect.min_lat"] = body.rect_south
+            params["boundary.rect.min_lon"] = body.rect_west
+            params["boundary.rect.max_lat"] = body.rect_north
+            params["boundary.rect.max_lon"] = body.rect_east
+
+        results = await _cached_geocode(params)
+        return OrjsonResponse({"results": results}, status=200)
     except Exception as e:
-        return JsonResponse({"error": f"Falha no geocode: {e}"}, status=500)
+        return OrjsonResponse({"error": f"Falha no geocode: {e}"}, status=500)
 
 @csrf_exempt
-def rota_carro(request):
+@_closes_client_off_asgi
+async def rota_carro(request):
     """
     POST /api/rota-carro
     Body:
@@ -229,35 +394,23 @@ def rota_carro(request):
     }
     """
     if request.method != "POST":
-        return JsonResponse({"error": "POST only"}, status=405)
-    if (err := _ensure_key()) is not None:
-        return err
+        return OrjsonResponse({"error": "POST only"}, status=405)
+    if not _ORS_READY:
+        return _missing_key()
 
     try:
-        body = json.loads(request.body.decode("utf-8"))
-        coords = _build_coordinates(body["origin"], body.get("waypoints"), body["destination"])
-        avoid = _sanitize_avoids(body.get("avoid_features"))
-        payload = {
-            "coordinates": coords,
-            "instructions": True,
-        }
-        options = {}
-        if avoid:
-            options["avoid_features"] = avoid
-        if options:
-            payload["options"] = options
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+        body = RouteBody.model_validate_json(request.body)
+    except ValidationError as e:
+        return OrjsonResponse({"error": error_message(e)}, status=400)
 
-    data = _call_ors_directions("driving-car", payload)
-    if isinstance(data, JsonResponse):
-        return data
+    build = _payload_builder("driving-car", tuple(sanitize_avoids(body.avoid_features)))
+    payload = build(body.coordinates())
 
-    summary = _extract_summary(data)
-    return JsonResponse({"summary": summary, "geojson": data}, status=200, safe=False)
+    return await _route_response(request, "driving-car", payload)
 
 @csrf_exempt
-def rota_caminhao(request):
+@_closes_client_off_asgi
+async def rota_caminhao(request):
     """
     POST /api/rota-caminhao
     Body:
@@ -273,50 +426,33 @@ def rota_caminhao(request):
     }
     """
     if request.method != "POST":
-        return JsonResponse({"error": "POST only"}, status=405)
-    if (err := _ensure_key()) is not None:
-        return err
+        return OrjsonResponse({"error": "POST only"}, status=405)
+    if not _ORS_READY:
+        return _missing_key()
 
     try:
-        body = json.loads(request.body.decode("utf-8"))
-        coords = _build_coordinates(body["origin"], body.get("waypoints"), body["destination"])
-
-        truck = body.get("truck", {})
-        restrictions = {
-            "height":   truck.get("height"),
-            "width":    truck.get("width"),
-            "length":   truck.get("length"),
-            "weight":   _kg_to_t_if_needed(truck.get("weight")),     # toneladas
-            "axleload": _kg_to_t_if_needed(truck.get("axleload")),   # toneladas
-        }
-        restrictions = {k: v for k, v in restrictions.items() if v is not None}
-
-        avoid = _sanitize_avoids(body.get("avoid_features"))
-
-        payload = {
-            "coordinates": coords,
-            "instructions": True,
-        }
-        options = {}
-        if avoid:
-            options["avoid_features"] = avoid
-        if restrictions:
-            options["profile_params"] = {"restrictions": restrictions}
-        options["vehicle_type"] = "hgv"
-        if options:
-            payload["options"] = options
-    except Exception as e:
-        return JsonResponse({"error": str(e)}, status=400)
+        body = TruckRouteBody.model_validate_json(request.body)
+    except ValidationError as e:
+        return OrjsonResponse({"error": error_message(e)}, status=400)
+
+    truck = body.truck or Truck()
+    restrictions = {
+        "height":   truck.height,
+        "width":    truck.width,
+        "length":   truck.length,
+        "weight":   kg_to_t_if_needed(truck.weight),     # toneladas
+        "axleload": kg_to_t_if_needed(truck.axleload),   # toneladas
+    }
+    restrictions = {k: v for k, v in restrictions.items() if v is not None}
 
-    data = _call_ors_directions("driving-hgv", payload)
-    if isinstance(data, JsonResponse):
-        return data
+    build = _payload_builder("driving-hgv", tuple(sanitize_avoids(body.avoid_features)))
+    payload = build(body.coordinates(), restrictions)
 
-    summary = _extract_summary(data)
-    return JsonResponse({"summary": summary, "geojson": data}, status=200, safe=False)
+    return await _route_response(request, "driving-hgv", payload)
 
 @csrf_exempt
-def obstaculos_altura(request):
+@_closes_client_off_asgi
+async def obstaculos_altura(request):
     """
     POST /api/obstaculos-altura
     Body:
@@ -336,10 +472,10 @@ def obstaculos_altura(request):
     }
     """
     if request.method != "POST":
-        return JsonResponse({"error": "POST only"}, status=405)
+        return OrjsonResponse({"error": "POST only"}, status=405)
 
     try:
-        body = json.loads(request.body.decode("utf-8"))
+        body = orjson.loads(request.body)
         bbox = body.get("bbox") or {}
         south = float(bbox["south"]); west = float(bbox["west"])
         north = float(bbox["north"]); east = float(bbox["east"])
@@ -347,61 +483,69 @@ def obstaculos_altura(request):
         vehicle_height_m = body.get("vehicle_height_m")
         vehicle_height_m = float(vehicle_height_m) if vehicle_height_m is not None else None
     except Exception:
-        return JsonResponse({"error": "bbox ou parâmetros inválidos"}, status=400)
+        return OrjsonResponse({"error": "bbox ou parâmetros inválidos"}, status=400)
 
     overpass_url = "https://overpass-api.de/api/interpreter"
-    # Nós e vias com maxheight / maxheight:physical dentro do bbox
-    query = f"""
-    [out:json][timeout:25];
+    # Nós e vias com maxheight / maxheight:physical dentro do bbox, uma sub-consulta
+    # por tipo em paralelo (o Overpass público libera ~2 slots simultâneos por IP).
+    # Saída em CSV só com as colunas usadas (bem menor que o JSON); separador tab
+    # porque valores como "3,5" têm vírgula. ::lat/::lon de vias vêm do "out center".
+    queries = [
+        f"""
+    [out:csv(::type,::id,::lat,::lon,maxheight,"maxheight:physical",bridge,tunnel;true)][timeout:25];
     (
-      node["maxheight"]({south},{west},{north},{east});
-      way["maxheight"]({south},{west},{north},{east});
-      node["maxheight:physical"]({south},{west},{north},{east});
-      way["maxheight:physical"]({south},{west},{north},{east});
+      {osm_type}["maxheight"]({south},{west},{north},{east});
+      {osm_type}["maxheight:physical"]({south},{west},{north},{east});
     );
     out tags center {limit};
     """
-
-    try:
-        r = _session.post(overpass_url, data={"data": query}, timeout=DEFAULT_TIMEOUT)
-        data = r.json()
-    except Exception as e:
-        return JsonResponse({"error": f"Falha Overpass: {e}"}, status=502)
-
+        for osm_type in ("node", "way")
+    ]
+
+    responses = await _fanout([_request("POST", overpass_url, data={"data": q}) for q in queries])
+    rows = []
+    seen = set()
+    for r in responses:
+        if isinstance(r, Exception):
+            return OrjsonResponse({"error": f"Falha Overpass: {r}"}, status=502)
+        if r.status_code != 200:
+            return OrjsonResponse({"error": f"Falha Overpass: HTTP {r.status_code}"}, status=502)
+        reader = csv.reader(io.StringIO(r.text), delimiter="\t", quoting=csv.QUOTE_NONE)
+        next(reader, None)  # cabeçalho
+        for row in reader:
+            if len(row) != 8:  # curta, ou tab dentro de um valor de tag (QUOTE_NONE)
+                continue
+            uid = (row[0], row[1])
+            if uid not in seen:
+                seen.add(uid)
+                rows.append(row)
+
+    # filtro por altura do veículo (se passado) aplicado logo após o parse, antes de
+    # montar o dict de saída; o limite encerra o laço assim que é atingido
+    filtered = vehicle_height_m is not None
     feats = []
-    for el in data.get("elements", []):
-        tags = el.get("tags", {}) or {}
-        raw = tags.get("maxheight") or tags.get("maxheight:physical")
+    for osm_type, osm_id, lat, lon, maxheight, maxheight_physical, bridge, tunnel in rows:
+        raw = maxheight or maxheight_physical
         if not raw:
             continue
 
-        mh_m = _parse_maxheight_to_meters(raw)
-        # coordenadas
-        if el.get("type") == "node":
-            lat = el.get("lat"); lon = el.get("lon")
-        else:
-            center = el.get("center") or {}
-            lat = center.get("lat"); lon = center.get("lon")
-            if lat is None or lon is None:
-                continue
+        mh_m = parse_maxheight_to_meters(raw)
+        if filtered and (mh_m is None or mh_m >= vehicle_height_m):
+            continue
+
+        # coordenadas (centro, no caso de vias)
+        if not lat or not lon:
+            continue
 
         kind = "way"
-        if tags.get("bridge") == "yes": kind = "bridge"
-        if tags.get("tunnel") == "yes": kind = "tunnel"
+        if bridge == "yes": kind = "bridge"
+        if tunnel == "yes": kind = "tunnel"
 
         feats.append({
-            "lat": lat, "lng": lon, "maxheight": raw, "maxheight_m": mh_m,
-            "kind": kind, "osm_id": el.get("id")
+            "lat": float(lat), "lng": float(lon), "maxheight": raw, "maxheight_m": mh_m,
+            "kind": kind, "osm_id": int(osm_id)
         })
+        if limit and len(feats) >= limit:
+            break
 
-    # filtro por altura do veículo (se passado)
-    filtered = False
-    if vehicle_height_m is not None:
-        filtered = True
-        feats = [f for f in feats if (f.get("maxheight_m") is not None and f["maxheight_m"] < vehicle_height_m)]
-
-    # aplica limite final, se necessário
-    if limit and len(feats) > limit:
-        feats = feats[:limit]
-
-    return JsonResponse({"features": feats, "filtered_by_height": filtered}, status=200)
+    return OrjsonResponse({"features": feats, "filtered_by_height": filtered}, status=200)
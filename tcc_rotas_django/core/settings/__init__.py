@@ -0,0 +1,8 @@
+"""
+Django settings for core project.
+
+base.py tem o que é comum; dev.py e prod.py completam por cima. O módulo usado por
+manage.py/wsgi/asgi é env.py, que escolhe o overlay por DJANGO_ENV. Este __init__
+fica vazio para que apontar direto (DJANGO_SETTINGS_MODULE=core.settings.prod) não
+carregue também o dev.
+"""
@@ -0,0 +1,204 @@
+"""
+Configuração comum a todos os ambientes; dev.py e prod.py completam por cima
+(escolhidos por DJANGO_ENV em core/settings/env.py).
+
+Deploy: pré-compile os .pyc uma vez no build para o start não reparsear os fontes:
+    python -m compileall -q -f -j 0 .
+Em filesystem somente leitura, aponte o cache para um diretório gravável:
+    PYTHONPYCACHEPREFIX=/tmp/pyc
+"""
+
+import os
+
+from django.utils.functional import SimpleLazyObject
+
+# Diretório base (str; o Django aceita strings em NAME, DIRS e STATIC_ROOT)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _load_env(path):
+    """
+    Lê linhas KEY=VALUE do .env para os.environ (sem sobrescrever o que já existe),
+    no lugar do python-dotenv. Ignora linhas vazias e comentários; tira aspas do valor.
+    """
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except OSError:
+        return
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == "#" or "=" not in line:
+                continue
+            k, _, v = line.partition("=")
+            v = v.strip()
+            if len(v) >= 2 and v[0] == v[-1] and v[0] in "\"'":
+                v = v[1:-1]
+            os.environ.setdefault(k.strip(), v)
+
+
+_env = os.environ  # lido uma vez abaixo via _env.get(...)
+
+# Valores aceitos como "ligado" nas flags do ambiente (DEBUG=yes, ENABLE_CORS=on, ...)
+_TRUTHY = frozenset(("1", "true", "yes", "on"))
+
+
+def _flag(name, default):
+    return _env.get(name, default).strip().lower() in _TRUTHY
+
+
+# Carrega variáveis do arquivo .env (SKIP_DOTENV=1 em containers, onde o ambiente já vem pronto)
+if not _flag("SKIP_DOTENV", "0"):
+    _load_env(os.path.join(BASE_DIR, ".env"))
+
+# Segurança
+_DEV_SECRET_KEY = "chave-insegura-dev"  # só para dev; prod.py recusa
+SECRET_KEY = _env.get("SECRET_KEY", _DEV_SECRET_KEY)
+DEBUG = False  # dev.py liga
+_hosts = _env.get("ALLOWED_HOSTS", "")
+ALLOWED_HOSTS = list(filter(None, (h.strip() for h in _hosts.split(",")))) if _hosts else []
+
+# CORS só quando o processo serve o front (ENABLE_CORS=0 em workers/comandos sem HTTP)
+_use_cors = _flag("ENABLE_CORS", "1")
+
+# Aplicações (admin e messages entram em dev.py)
+INSTALLED_APPS = (
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.staticfiles',
+    'app_rotas',
+    # Extras
+    *(('corsheaders',) if _use_cors else ()),  # para habilitar CORS
+    # 'rotas',       # descomente quando criar o app
+)
+
+# Middleware (WhiteNoise entra em prod.py, logo após o SecurityMiddleware)
+MIDDLEWARE = (
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+
+    # CORS antes do CommonMiddleware
+    *(('corsheaders.middleware.CorsMiddleware',) if _use_cors else ()),
+
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+)
+
+ROOT_URLCONF = 'core.urls'
+
+# Templates
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [os.path.join(BASE_DIR, "templates")],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            # só o admin renderiza templates (dev.py); a API responde JSON
+            'context_processors': [],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'core.wsgi.application'
+# Views da API são async: em produção rode sob ASGI, ex.:
+#   uvicorn core.asgi:application --workers N
+ASGI_APPLICATION = 'core.asgi.application'
+
+# Banco de dados
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # reaproveita a conexão entre requests (testada antes de reusar) e sem BEGIN/COMMIT por request
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'ATOMIC_REQUESTS': False,
+        'OPTIONS': {
+            'timeout': 20,
+            # WAL: leitores não bloqueiam escrita e menos fsync por commit
+            'init_command': (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA temp_store=MEMORY;"
+                "PRAGMA mmap_size=134217728;"
+                "PRAGMA cache_size=-64000;"
+            ),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Sessões no próprio cookie (assinado com SECRET_KEY): sem SELECT/UPDATE por request
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+SESSION_COOKIE_HTTPONLY = True
+
+# Validação de senha (lista montada só quando o auth pede, ex. createsuperuser/login no admin)
+def _password_validators():
+    return [
+        {'NAME': 'django.contrib.auth.password_validation.' + name}
+        for name in (
+            'UserAttributeSimilarityValidator',
+            'MinimumLengthValidator',
+            'CommonPasswordValidator',
+            'NumericPasswordValidator',
+        )
+    ]
+
+
+AUTH_PASSWORD_VALIDATORS = SimpleLazyObject(_password_validators)
+
+# Cache (Redis se REDIS_URL estiver definido; senão memória local do processo)
+REDIS_URL = _env.get("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Internacionalização
+LANGUAGE_CODE = 'pt-br'
+TIME_ZONE = 'America/Sao_Paulo'
+# As mensagens da API já são fixas em pt-br; só o admin usa os catálogos de tradução
+USE_I18N = _flag("USE_I18N", "0")
+USE_TZ = True
+
+# Arquivos estáticos
+STATIC_URL = 'static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+# SKIP_STATIC_PROBE=1 (layout conhecido, ex. imagem de produção) assume que static/ existe
+_static_dir = os.path.join(BASE_DIR, 'static')
+if _flag("SKIP_STATIC_PROBE", "0") or os.path.isdir(_static_dir):
+    STATICFILES_DIRS = [_static_dir]
+else:
+    STATICFILES_DIRS = []
+
+# Configuração CORS (CORS_ALL=0 e CORS_ORIGINS=https://a.com,https://b.com; prod.py já fecha)
+# tupla fixa; sem regexes para o corsheaders não testar padrões a cada request
+_cors_origins = tuple(o.strip() for o in _env.get("CORS_ORIGINS", "").split(",") if o.strip())
+CORS_ALLOW_ALL_ORIGINS = _flag("CORS_ALL", "1")
+CORS_ALLOWED_ORIGINS = () if CORS_ALLOW_ALL_ORIGINS else _cors_origins
+CORS_ALLOWED_ORIGIN_REGEXES = ()
+
+# Variáveis personalizadas do projeto
+# Lido só no primeiro uso: comandos sem system checks (shell, collectstatic) não resolvem;
+# os que rodam checks (migrate, runserver) e o servidor resolvem via W001 e o import das views
+ORS_API_KEY = SimpleLazyObject(lambda: _env.get("ORS_API_KEY", ""))
+GEOCODE_CACHE_TTL = int(_env.get("GEOCODE_CACHE_TTL", 48 * 3600))  # segundos
+GEOCODE_LRU_SIZE = 1024  # entradas do cache de geocode em memória, por processo
+ROUTE_CACHE_TTL = int(_env.get("ROUTE_CACHE_TTL", 3600))  # segundos
+ROUTE_CACHE_MAX_BYTES = 512 * 1024  # respostas maiores não vão para o cache
+
+# Pool de conexões HTTP para ORS/Overpass (por worker)
+HTTP_POOL_KEEPALIVE = int(_env.get("HTTP_POOL_KEEPALIVE", 64))
+HTTP_POOL_MAXSIZE = int(_env.get("HTTP_POOL_MAXSIZE", 128))
+HTTP2_ENABLED = _flag("HTTP2_ENABLED", "1")  # requer httpx[http2]
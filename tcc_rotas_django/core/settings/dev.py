@@ -0,0 +1,29 @@
+"""
+Desenvolvimento: DEBUG e admin (com messages e os context processors que ele exige).
+"""
+
+from .base import *  # noqa: F401,F403
+from .base import _flag
+
+DEBUG = _flag("DEBUG", "true")
+
+# Admin só faz sentido com páginas HTML; ENABLE_ADMIN=0 deixa o dev igual à API de produção
+if _flag("ENABLE_ADMIN", "1"):
+    INSTALLED_APPS = ('django.contrib.admin', *INSTALLED_APPS, 'django.contrib.messages')
+    MIDDLEWARE = (
+        *MIDDLEWARE,
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+    # novo dict em vez de alterar o de base.py (compartilhado com quem importa base)
+    TEMPLATES = [{
+        **TEMPLATES[0],
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    }]
+    USE_I18N = _flag("USE_I18N", "1")
@@ -0,0 +1,11 @@
+"""
+Escolhe o overlay por DJANGO_ENV (dev por padrão):
+    DJANGO_ENV=prod uvicorn core.asgi:application --workers N
+"""
+
+from .base import _env
+
+if _env.get("DJANGO_ENV", "dev").strip().lower() == "prod":
+    from .prod import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
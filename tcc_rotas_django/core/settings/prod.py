@@ -0,0 +1,38 @@
+"""
+Produção: sem DEBUG nem admin, estáticos via WhiteNoise e cookies só por HTTPS.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import _DEV_SECRET_KEY, _cors_origins, _env, _flag
+
+DEBUG = False
+
+# A sessão (inclusive o usuário logado) vai no cookie assinado com SECRET_KEY:
+# com a chave do repositório qualquer um forjaria sessões
+if SECRET_KEY in ("", _DEV_SECRET_KEY):
+    raise ImproperlyConfigured("Defina SECRET_KEY no ambiente; a chave de dev não vale em produção.")
+
+# WhiteNoise serve os estáticos já comprimidos (gzip/br) e com hash
+MIDDLEWARE = (
+    MIDDLEWARE[0],  # SecurityMiddleware
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    *MIDDLEWARE[1:],
+)
+# compressão e manifest gerados uma vez no collectstatic
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+WHITENOISE_MAX_AGE = 31536000  # 1 ano; nomes com hash mudam a cada deploy
+
+# Segurança (HTTPS normalmente terminado no proxy; SECURE_SSL_REDIRECT=1 se não houver)
+SESSION_COOKIE_SECURE = True
+CSRF_COOKIE_SECURE = True
+SECURE_SSL_REDIRECT = _flag("SECURE_SSL_REDIRECT", "0")
+SECURE_HSTS_SECONDS = int(_env.get("SECURE_HSTS_SECONDS", 3600))  # 0 desliga
+
+# CORS só para as origens de CORS_ORIGINS (CORS_ALL=1 reabre)
+CORS_ALLOW_ALL_ORIGINS = _flag("CORS_ALL", "0")
+CORS_ALLOWED_ORIGINS = () if CORS_ALLOW_ALL_ORIGINS else _cors_origins
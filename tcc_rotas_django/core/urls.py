@@ -14,11 +14,14 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
-from app_rotas.views import obstaculos_altura
+
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('app_rotas.urls')),
-    path('api/obstaculos-altura', obstaculos_altura),
 ]
+
+# Admin só é montado quando está em INSTALLED_APPS (ver core/settings/dev.py)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.append(path('admin/', admin.site.urls))